@@ -2,16 +2,27 @@ from designer import *
 import numpy as np
 import math as m
 from dataclasses import dataclass
+from functools import lru_cache
+import sys
 from levels import change_level
 
-@dataclass
+# numba is optional: when it is installed the point transform kernel is compiled to machine code,
+# otherwise the game falls back to plain NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# eq=False keeps box comparisons as identity checks; comparing field-by-field would be slower and
+# is ambiguous now that the size and center fields are arrays
+@dataclass(slots=True, eq=False)
 class Box:
     # Represents a box in 3d space, comprised of both data and DesignerObjects
     color: str
-    size: list[float] # [x,y,z]
-    center: list[float] # [x,y,z]
-    points: list[list[float]] # [[x,y,z]]
-    projected_points: list[list[float]] # [[x,y]]
+    size: np.ndarray # (3,) [x,y,z]; a view into the world's all_sizes array once the level is built
+    center: np.ndarray # (3,) [x,y,z]; a view into the world's all_centers array once the level is built
+    points: np.ndarray # (8,3) float32 array of vertex coordinates
+    projected_points: np.ndarray # (8,2) float32 array of screen coordinates
     vertices: list[DesignerObject]
     lines: list[DesignerObject]
     faces: list[DesignerObject]
@@ -25,8 +36,9 @@ class Button:
     border: DesignerObject
     text: DesignerObject
     color: str
+    idle_color: str # the background color shown when the mouse is not hovering over the button
 
-@dataclass
+@dataclass(slots=True)
 class World:
     # Contains all information about the 3d world at a given time
     base: Box
@@ -40,6 +52,14 @@ class World:
     previously_scaled_up_red_box: Box
     is_scaling: bool
     buttons: list[Button]
+    all_points: np.ndarray # (N*8,3) stacked points of every box; each box's points array is a view into it
+    all_projected_points: np.ndarray # (N*8,2) stacked screen coordinates, viewed the same way
+    all_centers: np.ndarray # (N,3) stacked centers of every box; each box's center is a row view into it
+    all_sizes: np.ndarray # (N,3) stacked sizes of every box, viewed the same way
+    all_types: np.ndarray # (N,) box type code per stacked row: -1 base, then the index into boxes
+    last_drawn_angle: list[float] # the angle the world was last rendered at
+    needs_redraw: bool # True when box data changed since the last render
+    render_order_key: tuple # the (octant, base side) the render order was last sorted for
 
 @dataclass
 class MainMenu:
@@ -69,24 +89,71 @@ class LevelMenu:
     title_border: DesignerObject
     level_buttons: list[Button]
     back_button: Button
+    hovered_index: int # index of the level button the mouse was last near, or -1
 
 # Constants
 TOTAL_LEVELS = 10
-CENTER = [get_width()/2, get_height()/2]
+WIDTH = get_width() # The window is never resized, so its size is read once here
+HEIGHT = get_height()
+CENTER = [WIDTH/2, HEIGHT/2]
 SCALE = 50.0 # Scale for rendering
 SCALE_MAX = 3.0 # Max size of red boxes
 SCALE_SPEED = 0.2 # Scale speed of red boxes
 
-PROJECTION_MATRIX = np.matrix([
-    [1, 0, 0],
-    [0, 1, 0]
-])
+# Box color strings interned once, so color comparisons and the renderer's color lookups can use
+# fast identity checks instead of comparing character by character
+BLACK = sys.intern("black")
+WHITE = sys.intern("white")
+RED = sys.intern("red")
+BLUE = sys.intern("blue")
+GREEN = sys.intern("green")
+PURPLE = sys.intern("purple")
+
+# Vertex indexes making up each of a box's 12 edges and 6 faces, as arrays so all of a box's line
+# and face coordinates can be gathered from its projected points in one indexing operation
+LINE_INDEXES = np.array([(0, 1), (1, 2), (2, 3), (3, 0), (4, 5), (5, 6), (6, 7), (7, 4), (0, 4), (1, 5), (2, 6),
+                         (3, 7)])
+FACE_INDEXES = np.array([(0, 1, 2, 3), (4, 5, 6, 7), (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7)])
+
+# The lines shown in the instructions menu, hoisted to module scope so entering the menu only
+# builds the text objects instead of also reassembling the strings
+INSTRUCTIONS_LINES = (
+    "The matrix can be panned around by clicking and dragging the mouse.",
+    "Red boxes can be grown by clicking on them.",
+    "Only one Red box can be grown at a time.",
+    "Blue boxes can be pushed by growing Red boxes or by other Blue boxes.",
+    "White boxes can block the growth of Red boxes in one or two directions.",
+    "To complete each matrix all Green boxes must be filled in with Blue boxes.",
+    "Filled Green boxes will turn Purple.",
+)
+
+# Level button labels built once at import, so rebuilding the level menu doesn't reassemble them
+LEVEL_BUTTON_LABELS = tuple("  " + str(i + 1) + "  " for i in range(TOTAL_LEVELS))
+
+# Shared size for all grid boxes; safe as one immutable tuple because create_level rebinds every
+# box's size to a row of the stacked sizes array before anything mutates it
+UNIT_SIZE = (1, 1, 1)
+
+# Render-order sort keys per 45-degree octant of y rotation, as (depth axis, depth sign,
+# tiebreak axis, tiebreak sign) rows, so calculate_render_order can look its keys up instead of
+# branching on angle ranges. Axis 0 is x and axis 2 is z
+OCTANT_TABLE = ((2, -1, 0, 1), (0, 1, 2, -1), (0, 1, 2, 1), (2, 1, 0, 1),
+                (2, 1, 0, -1), (0, -1, 2, 1), (0, -1, 2, -1), (2, -1, 0, -1))
+
+# Sign of each half-size offset for the 8 vertices of a box, top 4 points then bottom 4, so all of a
+# box's points can be generated with one broadcast instead of 8 handwritten rows
+POINT_SIGNS = np.array([
+    (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+    (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1)
+], dtype=np.float32)
+
+# Reusable buffer for the per-frame rotation and projection matrix, filled entry by entry so no
+# Python list has to be converted to an array every frame
+ROTATION_MATRIX_BUFFER = np.empty((2, 3), dtype=np.float32)
 
 # Global variables persist between world resets when loading levels
 level_number = 0
-completed_levels = []
-for i in range(0, TOTAL_LEVELS):
-    completed_levels.append(False)
+completed_levels = np.zeros(TOTAL_LEVELS, dtype=np.bool_)
 
 def create_button(message: str, x: int, y: int, color: str) -> Button:
     '''
@@ -103,11 +170,20 @@ def create_button(message: str, x: int, y: int, color: str) -> Button:
     '''
     x_padding = 4
     y_padding = 2
+
+    # Create the text once, size the rectangles from it, then raise it above them, instead of
+    # making a throwaway second copy of the text just to get it drawn on top
     button_text = text("black", message, 20, x, y)
     border = rectangle("white", button_text.width + 2 * x_padding, button_text.height + 2 * y_padding, x, y)
     background = rectangle(color, button_text.width + x_padding, button_text.height + y_padding, x, y)
-    button_text = text("black", message, 20, x, y)
-    return Button(background, border, button_text, color)
+    button_text.layer = ':above'
+
+    # Pick the non-hover shade once here so button_hover doesn't re-derive it every frame
+    if color == "gray":
+        idle_color = "darkgray"
+    else:
+        idle_color = "lightgreen"
+    return Button(background, border, button_text, color, idle_color)
 
 def button_hover(button: Button) -> bool:
     '''
@@ -124,10 +200,7 @@ def button_hover(button: Button) -> bool:
         button.background.color = button.color
         return True
     else:
-        if button.color == "gray":
-            button.background.color = "darkgray"
-        else:
-            button.background.color = "lightgreen"
+        button.background.color = button.idle_color
         return False
 
 def check_game_button_press(world: World):
@@ -151,7 +224,7 @@ def check_game_button_press(world: World):
                     # Reset Button
                     change_scene('game')
 
-def generate_points(size: list[float], position: list[float]) -> list[[]]:
+def generate_points(size: list[float], position: list[float]) -> np.ndarray:
     '''
     This function generates a set of 3d coordinates representing the 8 vertices of a box
 
@@ -160,27 +233,12 @@ def generate_points(size: list[float], position: list[float]) -> list[[]]:
         position (list[float]): a list of 3 floats representing the x, y, and z positions of the box
 
     Returns:
-        list[[]]: A list of 8 3x1 NumPy matrices, representing the x, y, and z position of the 8 vertices
-    '''
-    points = []
-    xpos = position[0]
-    ypos = position[1]
-    zpos = position[2]
-    xsize = size[0]
-    ysize = size[1]
-    zsize = size[2]
-    #top 4 points
-    points.append(np.matrix([xpos - xsize / 2, ypos - ysize / 2, zpos + zsize / 2]))
-    points.append(np.matrix([xpos + xsize / 2, ypos - ysize / 2, zpos + zsize / 2]))
-    points.append(np.matrix([xpos + xsize / 2, ypos + ysize / 2, zpos + zsize / 2]))
-    points.append(np.matrix([xpos - xsize / 2, ypos + ysize / 2, zpos + zsize / 2]))
-    # bottom 4 points
-    points.append(np.matrix([xpos - xsize / 2, ypos - ysize / 2, zpos - zsize / 2]))
-    points.append(np.matrix([xpos + xsize / 2, ypos - ysize / 2, zpos - zsize / 2]))
-    points.append(np.matrix([xpos + xsize / 2, ypos + ysize / 2, zpos - zsize / 2]))
-    points.append(np.matrix([xpos - xsize / 2, ypos + ysize / 2, zpos - zsize / 2]))
-
-    return points
+        np.ndarray: an (8,3) array holding the x, y, and z positions of the 8 vertices
+    '''
+    # Offset the center by half the size in each direction, with the sign table picking the corner
+    position = np.asarray(position, dtype=np.float32)
+    size = np.asarray(size, dtype=np.float32)
+    return position + POINT_SIGNS * (size * 0.5)
 
 def scale_points(box: Box, scale: list[float]):
     '''
@@ -198,42 +256,37 @@ def scale_points(box: Box, scale: list[float]):
     box.size[2] += scale[2]
     box.center[1] -= scale[1]/2
 
-def create_line(i: int, j: int, points: list[[]]) -> DesignerObject:
+def create_line(coordinates: list[float]) -> DesignerObject:
     '''
-    This function draws a line in the viewport, making up one edge of a box, based on the list of 2d coordinates and
-    2 indexes given
+    This function draws a line in the viewport, making up one edge of a box, based on the list of screen
+    coordinates given
 
     Args:
-        i (int): the index in the list of the first point of the line
-        j (int): the index in the list of the second point of the line
-        points (list[[]]): the list of 2d coordinates representing a projected cube to be used for drawing lines
+        coordinates (list[float]): the two endpoints of the line as [x1, y1, x2, y2]
 
     Returns:
-        DesignerObject: The line object generated from the list and indexes
+        DesignerObject: The line object generated from the coordinates
     '''
-    # Returns a line connecting points at indexes i and j in list points
-    return line("black", points[i][0], points[i][1], points[j][0], points[j][1])
+    # Returns a line connecting the two given endpoints
+    return line(BLACK, coordinates[0], coordinates[1], coordinates[2], coordinates[3])
 
-def create_face(color: str, i: int, j: int, k: int, l: int, points: list[[]]) -> DesignerObject:
+def create_face(color: str, coordinates: list[float]) -> DesignerObject:
     '''
-    This function draws a shape in the viewport, making up one face of a box, based on the list of 2d coordinates
-    and 2 indexes given
+    This function draws a shape in the viewport, making up one face of a box, based on the list of screen
+    coordinates given
 
     Args:
-        i (int): the index in the list of the first vertex of the shape
-        j (int): the index in the list of the second vertex of the shape
-        k (int): the index in the list of the third vertex of the shape
-        l (int): the index in the list of the fourth vertex of the shape
-        points (list[[]]): the list of 2d coordinates representing a projected cube to be used for drawing shapes
+        color (str): the color of the face
+        coordinates (list[float]): the four corners of the face as [x1, y1, x2, y2, x3, y3, x4, y4]
 
     Returns:
-        DesignerObject: The shape object generated from the list and indexes
+        DesignerObject: The shape object generated from the coordinates
     '''
-    # Returns a shape of chosen color connecting points at indexes i, j, k, and l in list points
-    return shape(color, [points[i][0], points[i][1], points[j][0], points[j][1], points[k][0], points[k][1],
-                         points[l][0], points[l][1]], absolute=True, anchor='topleft')
+    # Returns a shape of chosen color connecting the four given corners
+    return shape(color, coordinates, absolute=True, anchor='topleft')
 
-def create_box(size: list[float], position: list[float], type: str) -> Box:
+def create_box(size: list[float], position: list[float], type: str, points: np.ndarray = None,
+               projected_points: np.ndarray = None) -> Box:
     '''
     This function generates a box object of the given size, position, and type
 
@@ -242,55 +295,81 @@ def create_box(size: list[float], position: list[float], type: str) -> Box:
         position (list[float]): a list containing the x, y, and z positions of the box
         type (str): can be either "base", "white", "red", "blue", or "green", which correspond to the color and
         behavior of the box
+        points (np.ndarray): the box's (8,3) vertex coordinates when already generated in a batch,
+        or None to generate them here
+        projected_points (np.ndarray): the (8,2) screen coordinates matching points, or None
 
     Returns:
         Box: the box object generated from the inputs
     '''
     # Returns a box of given type, size, and center position
 
-    projected_points = []
     vertices = []
     lines = []
     faces = []
 
     if type == "base":
-        type = "white"
-
-    points = generate_points(size, position)
+        type = WHITE
 
-    for point in points:
-        # @ is the matrix multiplication operator
-        # Use transpose to change point from 1x3 to 3x1 matrix to make multiplication with 2d matrix compatible
-        projected2d = PROJECTION_MATRIX @ point.transpose()
+    if points is None:
+        points = generate_points(size, position)
 
-        # Set x and y to projected position
-        x = projected2d[0, 0] * SCALE + CENTER[0]
-        y = projected2d[1, 0] * SCALE + CENTER[1]
+        # Project all 8 points at once by dropping z, then scale and recenter into screen space
+        # Screen coordinates are kept in the same compact float32 storage as the 3d points
+        projected_points = (points[:, :2] * SCALE + CENTER).astype(np.float32)
 
-        # Add 8 circles representing the vertices
-        vertices.append(circle("black", 5, x, y))
+    # Add 8 circles representing the vertices
+    # tolist converts the coordinates to plain Python floats, which pygame requires for positions
+    for projected_point in projected_points.tolist():
+        vertices.append(circle(BLACK, 5, projected_point[0], projected_point[1]))
 
-        # Add the coordinates of the projected position to projected_points
-        projected_points.append([x, y])
+    # Gather every line's and face's screen coordinates in two bulk lookups
+    line_coordinates = projected_points[LINE_INDEXES].reshape(12, 4).tolist()
+    face_coordinates = projected_points[FACE_INDEXES].reshape(6, 8).tolist()
 
     # Add 12 lines outlining cube to list lines
-    for p in range(4):
-        lines.append(create_line(p, (p + 1) % 4, projected_points))
-        lines.append(create_line(p + 4, (p + 1) % 4 + 4, projected_points))
-        lines.append(create_line(p, p + 4, projected_points))
+    for coordinates in line_coordinates:
+        lines.append(create_line(coordinates))
 
-    faces.append(create_face(type, 0, 1, 2, 3, projected_points))
-    faces.append(create_face(type, 4, 5, 6, 7, projected_points))
-    for p in range(4):
-        faces.append(create_face(type, p, (p + 1) % 4, (p + 1) % 4 + 4, p + 4, projected_points))
+    # Add the 6 faces of the cube to list faces
+    for coordinates in face_coordinates:
+        faces.append(create_face(type, coordinates))
 
     return Box(type, size, position, points, projected_points, vertices, lines, faces, False,
                [0.0, 0.0, 0.0])
 
+def create_boxes(positions: tuple, color: str) -> list[Box]:
+    '''
+    This function creates one unit box per given position, generating and projecting every box's
+    vertices in a single batched broadcast before the per-box designer objects are built
+
+    Args:
+        positions (tuple): the (x, y, z) center positions of the boxes
+        color (str): the color of the boxes
+
+    Returns:
+        list[Box]: the created boxes
+    '''
+    if not positions:
+        return []
+
+    # One broadcast produces all N boxes' vertices, and one expression projects them, instead of
+    # N separate generate-and-project rounds
+    centers = np.asarray(positions, dtype=np.float32)
+    offsets = POINT_SIGNS * (np.asarray(UNIT_SIZE, dtype=np.float32) * 0.5)
+    points = centers[:, None, :] + offsets
+    projected_points = (points[:, :, :2] * SCALE + CENTER).astype(np.float32)
+
+    boxes = []
+    for index, position in enumerate(positions):
+        boxes.append(create_box(UNIT_SIZE, position, color, points[index], projected_points[index]))
+    return boxes
+
 def destroy_box(box: Box):
     '''
-    This function destroys a box's rendered DesignerObjects, but not its data. This allows all the
-    DesignerObjects to be regenerated based on updated data
+    This function destroys a box's rendered lines and faces, but not its data or vertices. This allows the
+    lines and faces to be regenerated based on updated data, while the vertex circles are simply moved,
+    since designer can reposition a circle but cannot reshape an existing line or polygon
 
     Args:
         box (Box): the box to be destroyed
@@ -298,87 +377,183 @@ def destroy_box(box: Box):
     Returns:
         None
     '''
-    for vertex in box.vertices:
-        destroy(vertex)
     for line in box.lines:
         destroy(line)
     for face in box.faces:
         destroy(face)
 
-def draw_box(angle: list[float], box: Box):
+def calculate_rotation_matrix(angle: list[float]) -> np.ndarray:
     '''
-        This function updated the given box based on new size, position, and world rotation.
+    This function builds the matrix that rotates and projects the world's points, so it can be computed once per frame
+    and shared by every box
+
+    Args:
+        angle (list[float]): the current x, y, and z angle of all objects in the world
+
+    Returns:
+        np.ndarray: a (2,3) matrix combining the x, y, and z rotations with the 2d projection
+    '''
+    # Compute the sines and cosines of all three angles with one vectorized call each, then unpack
+    # them so each is still read once per matrix entry below
+    cosines = np.cos(angle)
+    sines = np.sin(angle)
+    cos_x = cosines[0]
+    sin_x = sines[0]
+    cos_y = cosines[1]
+    sin_y = sines[1]
+    cos_z = cosines[2]
+    sin_z = sines[2]
+
+    # The product of the x, y, and z rotation matrices written out entry by entry, so no
+    # intermediate matrices need to be built or multiplied
+    # Keeping only the first 2 rows drops z, folding the 2d projection into the same matrix
+    rotation_matrix = ROTATION_MATRIX_BUFFER
+    rotation_matrix[0, 0] = cos_z * cos_y
+    rotation_matrix[0, 1] = cos_z * sin_y * sin_x - sin_z * cos_x
+    rotation_matrix[0, 2] = cos_z * sin_y * cos_x + sin_z * sin_x
+    rotation_matrix[1, 0] = sin_z * cos_y
+    rotation_matrix[1, 1] = sin_z * sin_y * sin_x + cos_z * cos_x
+    rotation_matrix[1, 2] = sin_z * sin_y * cos_x - cos_z * sin_x
+    return rotation_matrix
+
+if njit is None:
+    def transform_points(points: np.ndarray, rotation_matrix: np.ndarray, scale: float, center_x: float,
+                         center_y: float, projected_points: np.ndarray):
+        '''
+        This function rotates, projects, and scales the given points into screen space in one matrix
+        multiplication, writing the results into projected_points. It can be handed one box's 8
+        points or the stacked points of every box in the world
 
         Args:
-            angle (list[float]): the current x, y, and z angle of all objects in the world
-            box (Box): the box to be updated
+            points (np.ndarray): an (N,3) array of vertex coordinates
+            rotation_matrix (np.ndarray): the (2,3) rotation and projection matrix for the current frame
+            scale (float): the rendering scale
+            center_x (float): the x position of the center of the viewport
+            center_y (float): the y position of the center of the viewport
+            projected_points (np.ndarray): the (N,2) array to write the screen coordinates into
 
         Returns:
             None
         '''
-    rotation_x_matrix = np.matrix([
-        [1, 0, 0],
-        [0, m.cos(angle[0]), -m.sin(angle[0])],
-        [0, m.sin(angle[0]), m.cos(angle[0])]
-    ])
-
-    rotation_y_matrix = np.matrix([
-        [m.cos(angle[1]), 0, m.sin(angle[1])],
-        [0, 1, 0],
-        [-m.sin(angle[1]), 0, m.cos(angle[1])]
-    ])
-
-    rotation_z_matrix = np.matrix([
-        [m.cos(angle[2]), -m.sin(angle[2]), 0],
-        [m.sin(angle[2]), m.cos(angle[2]), 0],
-        [0, 0, 1]
-    ])
-
-    destroy_box(box)
-
-    box.points.clear()
-    box.points = generate_points(box.size, box.center)
-
-    # Calculating rotation and projection
-    for index, point in enumerate(box.points):
-        # @ is the matrix multiplication operator
-        # Use transpose to change point from 1x3 to 3x1 matrix to make multiplication with 2d matrix compatible
+        np.matmul(points, rotation_matrix.T, out=projected_points)
+        projected_points *= scale
+        projected_points[:, 0] += center_x
+        projected_points[:, 1] += center_y
+else:
+    # The explicit signature makes numba compile the kernel at import time rather than on the first
+    # frame, so no warmup stall is paid once the game is running
+    @njit('void(float32[:, ::1], float32[:, ::1], float64, float64, float64, float32[:, ::1])',
+          cache=True)
+    def transform_points(points: np.ndarray, rotation_matrix: np.ndarray, scale: float, center_x: float,
+                         center_y: float, projected_points: np.ndarray):
+        '''
+        The numba version of the transform: the whole rotate, project, and scale step written as
+        scalar math so it compiles to one machine-code loop with no NumPy dispatch overhead. The
+        arguments match the NumPy version above
+        '''
+        for index in range(points.shape[0]):
+            x = points[index, 0]
+            y = points[index, 1]
+            z = points[index, 2]
+            projected_points[index, 0] = (rotation_matrix[0, 0] * x + rotation_matrix[0, 1] * y
+                                          + rotation_matrix[0, 2] * z) * scale + center_x
+            projected_points[index, 1] = (rotation_matrix[1, 0] * x + rotation_matrix[1, 1] * y
+                                          + rotation_matrix[1, 2] * z) * scale + center_y
+
+if njit is None:
+    def find_neighbor_box(all_centers: np.ndarray, all_types: np.ndarray, center_axis: float,
+                          center_other_axis: float, axis: int, other_axis: int, direction: int) -> int:
+        '''
+        This function finds the red, white, or blue box adjacent to the given center along the given
+        axis and direction, searching the world's stacked centers in one pass
 
-        # For each 3d coordinate, multiply by rotation_z to rotate points about the z axis
-        rotated2d = rotation_x_matrix @ point.transpose()
-        rotated2d = rotation_y_matrix @ rotated2d
-        rotated2d = rotation_z_matrix @ rotated2d
-        # For each 3d coordinate, multiply by projection_matrix to convert to 2d coordinate
-        projected2d = PROJECTION_MATRIX @ rotated2d
+        Args:
+            all_centers (np.ndarray): the world's (N,3) stacked box centers
+            all_types (np.ndarray): the world's (N,) box type codes
+            center_axis (float): the checked box's center coordinate along the checked axis
+            center_other_axis (float): the checked box's center coordinate along the other horizontal axis
+            axis (int): the axis along which the check is performed, 0 represents x and 2 represents z
+            other_axis (int): the other horizontal axis, 2 when axis is 0 and 0 when axis is 2
+            direction (int): the direction within the axis, 1 for positive and -1 for negative
 
-        # Set projected x and y values for each coordinate
-        x = projected2d[0, 0] * SCALE + CENTER[0]
-        y = projected2d[1, 0] * SCALE + CENTER[1]
+        Returns:
+            int: the row index of the adjacent box in the stacked arrays, or -1 if the space is empty
+        '''
+        matches = np.flatnonzero((all_centers[:, axis] + direction == center_axis) &
+                                 (all_centers[:, other_axis] == center_other_axis) &
+                                 (all_types >= 0) & (all_types != 3)) # 3 is green, -1 is the base
+        if matches.size:
+            return int(matches[0])
+        return -1
+else:
+    @njit(cache=True)
+    def find_neighbor_box(all_centers: np.ndarray, all_types: np.ndarray, center_axis: float,
+                          center_other_axis: float, axis: int, other_axis: int, direction: int) -> int:
+        '''
+        The numba version of the neighbor search: the same scan written as a scalar loop so it
+        compiles to machine code. The arguments match the NumPy version above
+        '''
+        for index in range(all_centers.shape[0]):
+            if (all_types[index] >= 0 and all_types[index] != 3 # 3 is green, -1 is the base
+                    and all_centers[index, axis] + direction == center_axis
+                    and all_centers[index, other_axis] == center_other_axis):
+                return index
+        return -1
+
+def draw_box(box: Box, render_slot: int):
+    '''
+        This function rebuilds the given box's rendered geometry from its already-projected screen
+        coordinates. The projection itself happens once for all boxes in main.
 
-        # Add x and y values to list of projected points
-        box.projected_points[index] = [x, y]
+        Args:
+            box (Box): the box to be updated
+            render_slot (int): the box's position in the render order, used to pick the scene layers its
+                DesignerObjects are drawn on
 
-        # Move corresponding vertices to newly calculated positions
-        box.vertices[index].x = x
-        box.vertices[index].y = y
+        Returns:
+            None
+        '''
+    destroy_box(box)
 
+    # Bind the attributes touched by the loops below to locals, so each access is a single fast
+    # local lookup instead of an attribute lookup per iteration
+    projected_points = box.projected_points
+    vertices = box.vertices
+    faces = box.faces
+    lines = box.lines
+    color = box.color
+
+    # Each render slot has a pair of scene layers so the recreated lines and faces stack in render
+    # order while still staying below their own box's persistent vertex circles
+    box_layer = "boxes" + str(render_slot)
+    vertex_layer = "vertices" + str(render_slot)
+
+    # Move the existing vertices to the newly calculated positions instead of recreating them
+    # tolist converts the coordinates to plain Python floats, which pygame requires for positions
+    for index, projected_point in enumerate(projected_points.tolist()):
+        vertex = vertices[index]
+        vertex.x = projected_point[0]
+        vertex.y = projected_point[1]
+        vertex.layer = vertex_layer
 
     # Reloading box geometry
+    # Gather every line's and face's screen coordinates in two bulk lookups
+    face_coordinates = projected_points[FACE_INDEXES].reshape(6, 8).tolist()
+    line_coordinates = projected_points[LINE_INDEXES].reshape(12, 4).tolist()
+
     # Generates 6 new faces
-    box.faces[0] = create_face(box.color, 0, 1, 2, 3, box.projected_points)
-    box.faces[1] = create_face(box.color, 4, 5, 6, 7, box.projected_points)
-    for p in range(4):
-        box.faces[p + 2] = create_face(box.color, p, (p + 1) % 4, (p + 1) % 4 + 4, p + 4, box.projected_points)\
+    # The create_face and create_line helpers are inlined here since the call overhead adds up
+    # across every face and line of every box each frame
+    for index, coordinates in enumerate(face_coordinates):
+        face = shape(color, coordinates, absolute=True, anchor='topleft')
+        face.layer = box_layer
+        faces[index] = face
 
     # Generates 12 new lines
-    for p in range(4):
-        box.lines[p] = create_line(p, (p + 1) % 4, box.projected_points)
-        box.lines[p + 4] = create_line(p + 4, (p + 1) % 4 + 4, box.projected_points)
-        box.lines[p + 8] = create_line(p, p + 4, box.projected_points)
-
-    # Generates 8 new vertices
-    for index, projected_point in enumerate(box.projected_points):
-        box.vertices[index] = circle("black", 5, projected_point[0], projected_point[1])
+    for index, coordinates in enumerate(line_coordinates):
+        new_line = line(BLACK, coordinates[0], coordinates[1], coordinates[2], coordinates[3])
+        new_line.layer = box_layer
+        lines[index] = new_line
 
 def main(world: World):
     '''
@@ -392,17 +567,29 @@ def main(world: World):
         None
     '''
 
-    calculate_render_order(world)
-
-
-
     # Rotating boxes with mouse pan
     if world.is_panning:
         pan_world(world)
 
-    # render all boxes
-    for box in world.box_render_order:
-        draw_box(world.angle, box)
+    # Everything rendered is a pure function of the angle and the box data, so when neither has
+    # changed since the last frame the whole reorder, transform, and redraw can be skipped
+    if world.needs_redraw or world.is_scaling or world.angle != world.last_drawn_angle:
+        calculate_render_order(world)
+
+        # Refresh every box's 3d points, then rotate and project all of them with a single call on the
+        # world's stacked points array, which each box's points and projected_points arrays view into
+        rotation_matrix = calculate_rotation_matrix(world.angle)
+        for box in world.box_render_order:
+            box.points[:] = generate_points(box.size, box.center)
+        transform_points(world.all_points, rotation_matrix, SCALE, CENTER[0], CENTER[1],
+                         world.all_projected_points)
+
+        # render all boxes
+        for render_slot, box in enumerate(world.box_render_order):
+            draw_box(box, render_slot)
+
+        world.last_drawn_angle = list(world.angle)
+        world.needs_redraw = False
 
     if world.is_scaling:
         directions = [True, True, True]
@@ -415,6 +602,10 @@ def main(world: World):
 
         scale_red_box(world, directions)
 
+        # The scaling and pushing above changed box data after this frame's render, so the next
+        # frame must redraw even if the angle stays the same
+        world.needs_redraw = True
+
 
     for button in world.buttons:
         button_hover(button)
@@ -430,79 +621,33 @@ def calculate_render_order(world: World):
     Returns:
         None
     '''
-    # Clear render order so it can be recalculated
-    world.box_render_order.clear()
-
-    for type in world.boxes:
-        # Run through all 4 box types
-
-        for box in type:
-            # This loop adds all boxes to a new list insertion sorted from furthest to closest to the camera,
-            # therefore preventing layering issues upon rendering
-
-            i = 0
-
-            # When y rotation is between 45 degrees and 135 degrees, render from smallest x to largest x
-            if (m.pi * 2 / 8) <= world.angle[1] % (m.pi * 2) < (m.pi * 2 / 8) * 3:
-                for render_box in world.box_render_order:
-                    if box.center[0] > render_box.center[0]:
-                        i += 1
-                    # If 2 boxes have the same x, check if rotation is greater than or less than 90 degrees and render
-                    # based on z value
-                    elif box.center[0] == render_box.center[0]:
-                        if world.angle[1] % (m.pi * 2) > (m.pi * 2 / 8) * 2:
-                            if box.center[2] > render_box.center[2]:
-                                i += 1
-                        else:
-                            if box.center[2] < render_box.center[2]:
-                                i += 1
-
-            # When y rotation is between 135 degrees and 225 degrees, render from smallest z to largest z
-            if (m.pi * 2 / 8) * 3 <= world.angle[1] % (m.pi * 2) < (m.pi * 2 / 8) * 5:
-                for render_box in world.box_render_order:
-                    if box.center[2] > render_box.center[2]:
-                        i += 1
-                    # If 2 boxes have the same z, check if rotation is greater than or less than 180 degrees and render
-                    # based on x value
-                    elif box.center[2] == render_box.center[2]:
-                        if world.angle[1] % (m.pi * 2) > (m.pi * 2 / 8) * 4:
-                            if box.center[0] < render_box.center[0]:
-                                i += 1
-                        else:
-                            if box.center[0] > render_box.center[0]:
-                                i += 1
-
-            # When y rotation is between 225 degrees and 315 degrees, render from largest x to smallest x
-            if (m.pi * 2 / 8) * 5 <= world.angle[1] % (m.pi * 2) < (m.pi * 2 / 8) * 7:
-                for render_box in world.box_render_order:
-                    if box.center[0] < render_box.center[0]:
-                        i += 1
-                    # If 2 boxes have the same x, check if rotation is greater than or less than 270 degrees and render
-                    # based on z value
-                    elif box.center[0] == render_box.center[0]:
-                        if world.angle[1] % (m.pi * 2) > (m.pi * 2 / 8) * 6:
-                            if box.center[2] < render_box.center[2]:
-                                i += 1
-                        else:
-                            if box.center[2] > render_box.center[2]:
-                                i += 1
-
-            # When y rotation is greater than 315 degrees or fewer than 45 degrees, render from largest z to smallest z
-            if (m.pi * 2 / 8) * 7 <= world.angle[1] % (m.pi * 2) or world.angle[1] % (m.pi * 2) < (m.pi * 2 / 8):
-                for render_box in world.box_render_order:
-                    if box.center[2] < render_box.center[2]:
-                        i += 1
-                    # If 2 boxes have the same z, check if rotation is less than 45 degrees or greater than 315 degrees
-                    # and render based on x value
-                    elif box.center[2] == render_box.center[2]:
-                        if world.angle[1] % (m.pi * 2) < (m.pi / 2):
-                            if box.center[0] > render_box.center[0]:
-                                i += 1
-                        else:
-                            if box.center[0] < render_box.center[0]:
-                                i += 1
-
-            world.box_render_order.insert(i, box)
+    angle_y = world.angle[1] % (m.pi * 2)
+    octant = int(angle_y / (m.pi / 4))
+
+    # The order only changes when box data changes or the camera crosses an octant or base-side
+    # boundary, so panning around within one region can reuse the previous frame's order
+    order_key = (octant, world.angle[0] % (m.pi * 2) > m.pi)
+    if not world.needs_redraw and order_key == world.render_order_key:
+        return
+    world.render_order_key = order_key
+
+    # Flatten the per-type lists so every box gets a sort key at the same index as its center
+    # Row 0 of all_centers is the base, so the remaining rows line up with the flattened box list
+    all_boxes = [box for type in world.boxes for box in type]
+    centers = world.all_centers[1:]
+
+    # Look up the depth and tiebreak axes and signs for the current 45-degree octant of y rotation,
+    # replacing the old chain of angle-range branches; sorting ascending by (depth, tiebreak) yields
+    # the same furthest-to-closest order the old insertion sort produced
+    depth_axis, depth_sign, tiebreak_axis, tiebreak_sign = OCTANT_TABLE[octant]
+    depth = depth_sign * centers[:, depth_axis]
+    tiebreak = tiebreak_sign * centers[:, tiebreak_axis]
+
+    # lexsort keys are listed least significant first. The reverse flattened index breaks full-key
+    # ties the way the old insertion sort did: a blue box sharing its cell with a green box flattens
+    # later but must render later too, so the filled box's purple recolor draws on top
+    order = np.lexsort((-np.arange(len(all_boxes)), tiebreak, depth))
+    world.box_render_order = [all_boxes[index] for index in order]
 
     # Rendering level base before or after cubes based on x rotation
     if world.angle[0] % (m.pi * 2) > m.pi and (
@@ -525,9 +670,17 @@ def red_box_interaction(world: World):
         None
     '''
     # Creates a list containing all boxes colliding with the mouse upon clicking
+    mouse_x = get_mouse_x()
+    mouse_y = get_mouse_y()
     boxes_clicked = []
     for type in world.boxes:
         for box in type:
+            # Skip the per-face hit tests when the mouse is outside the box's screen bounding box,
+            # which the already-projected points give in two reductions
+            minimums = box.projected_points.min(axis=0)
+            maximums = box.projected_points.max(axis=0)
+            if not (minimums[0] <= mouse_x <= maximums[0] and minimums[1] <= mouse_y <= maximums[1]):
+                continue
             for face in box.faces:
                 if colliding_with_mouse(face):
                     boxes_clicked.append(box)
@@ -535,14 +688,16 @@ def red_box_interaction(world: World):
     # Checks if any boxes were clicked as a safeguard
     if boxes_clicked:
         # Calculates which of all clicked boxes is the closest to the camera using world.box_render_order
+        # A single reverse scan with set membership replaces the old nested loop over both lists
+        clicked_ids = {id(box) for box in boxes_clicked}
         closest_clicked = boxes_clicked[0]
-        for box in world.box_render_order:
-            for box_clicked in boxes_clicked:
-                if box == box_clicked:
-                    closest_clicked = box_clicked
+        for box in reversed(world.box_render_order):
+            if id(box) in clicked_ids:
+                closest_clicked = box
+                break
 
         # Checks if the closest clicked box is red
-        if closest_clicked.color == "red" and not world.is_scaling:
+        if closest_clicked.color == RED and not world.is_scaling:
             world.is_clicking_interactable = True
             if closest_clicked.size[1] == 1.0 and closest_clicked != world.scaled_up_red_box:
                 world.previously_scaled_up_red_box = world.scaled_up_red_box
@@ -605,38 +760,47 @@ def move_blue_box(world: World, pushing_box: Box):
     Returns:
         None
     '''
-    for blue_box in world.boxes[2]: # 2 is blue boxes
+    blue_boxes = world.boxes[2] # 2 is blue boxes
+    if not blue_boxes:
+        return
+
+    # Blue boxes occupy contiguous rows of the stacked centers after the base, red, and white boxes
+    blue_start = 1 + len(world.boxes[0]) + len(world.boxes[1])
+    blue_centers = world.all_centers[blue_start:blue_start + len(blue_boxes)]
+
+    # Compare the pushing box against every blue box at once to find which neighbors it pushes
+    # along each axis and how fast, instead of testing each box one by one
+    pushed_x = np.zeros(len(blue_boxes), dtype=bool)
+    pushed_z = np.zeros(len(blue_boxes), dtype=bool)
+    x_movements = np.zeros(len(blue_boxes), dtype=np.float32)
+    z_movements = np.zeros(len(blue_boxes), dtype=np.float32)
+    if pushing_box.color == RED:
+        # A growing red box pushes adjacent blue boxes away from itself
+        x_offsets = blue_centers[:, 0] - pushing_box.center[0]
+        z_offsets = blue_centers[:, 2] - pushing_box.center[2]
+        pushed_z = (x_offsets == 0) & (np.abs(z_offsets) == 1) & (pushing_box.size[2] > 1.0)
+        pushed_x = (z_offsets == 0) & (np.abs(x_offsets) == 1) & (pushing_box.size[0] > 1.0)
+        z_movements = np.sign(z_offsets) * (SCALE_SPEED / 2)
+        x_movements = np.sign(x_offsets) * (SCALE_SPEED / 2)
+
+    elif pushing_box.color == BLUE:
+        # A moving blue box passes its own movement on to adjacent blue boxes
+        x_offsets = blue_centers[:, 0] - round(pushing_box.center[0])
+        z_offsets = blue_centers[:, 2] - round(pushing_box.center[2])
+        pushed_z = (x_offsets == 0) & (np.abs(z_offsets) == 1)
+        pushed_x = (z_offsets == 0) & (np.abs(x_offsets) == 1)
+        z_movements.fill(pushing_box.movement[2])
+        x_movements.fill(pushing_box.movement[0])
+
+    for index, blue_box in enumerate(blue_boxes):
         if not blue_box.is_moving:
-            blue_box.color = "blue"
-            if pushing_box.color == "red":
-
-                if pushing_box.center[0] == blue_box.center[0] and pushing_box.size[2] > 1.0:
-                    if pushing_box.center[2] == blue_box.center[2] - 1:
-                        blue_box.is_moving = True
-                        blue_box.movement[2] = SCALE_SPEED/2
-                    elif pushing_box.center[2] == blue_box.center[2] + 1:
-                        blue_box.is_moving = True
-                        blue_box.movement[2] = -SCALE_SPEED/2
-
-                elif pushing_box.center[2] == blue_box.center[2] and pushing_box.size[0] > 1.0:
-                    if pushing_box.center[0] == blue_box.center[0] - 1:
-                        blue_box.is_moving = True
-                        blue_box.movement[0] = SCALE_SPEED/2
-                    elif pushing_box.center[0] == blue_box.center[0] + 1:
-                        blue_box.is_moving = True
-                        blue_box.movement[0] = -SCALE_SPEED/2
-
-            elif pushing_box.color == "blue":
-                if round(pushing_box.center[0]) == blue_box.center[0]:
-                    if (round(pushing_box.center[2]) == blue_box.center[2] - 1 or
-                            round(pushing_box.center[2]) == blue_box.center[2] + 1):
-                        blue_box.is_moving = True
-                        blue_box.movement[2] = pushing_box.movement[2]
-                if round(pushing_box.center[2]) == blue_box.center[2]:
-                    if (round(pushing_box.center[0]) == blue_box.center[0] - 1 or
-                            round(pushing_box.center[0]) == blue_box.center[0] + 1):
-                        blue_box.is_moving = True
-                        blue_box.movement[0] = pushing_box.movement[0]
+            blue_box.color = BLUE
+            if pushed_z[index]:
+                blue_box.is_moving = True
+                blue_box.movement[2] = z_movements[index]
+            if pushed_x[index]:
+                blue_box.is_moving = True
+                blue_box.movement[0] = x_movements[index]
 
             if blue_box.is_moving:
                 move_blue_box(world, blue_box)
@@ -644,7 +808,7 @@ def move_blue_box(world: World, pushing_box: Box):
         else:
             blue_box.center[0] += blue_box.movement[0]
             blue_box.center[2] += blue_box.movement[2]
-            if pushing_box.size[1] >= SCALE_MAX or (pushing_box.color == "blue" and pushing_box.is_moving == False):
+            if pushing_box.size[1] >= SCALE_MAX or (pushing_box.color == BLUE and pushing_box.is_moving == False):
                 blue_box.is_moving = False
                 blue_box.movement = [0, 0, 0]
                 blue_box.center[0] = round(blue_box.center[0])
@@ -666,25 +830,24 @@ def check_box_collision(world: World, checked_box: Box, axis: int, direction: in
     Returns:
         bool: True if there are no collisions, False if there is one
     '''
-    # Run through all boxes in the world and filter out any that aren't white or blue
     other_axis = 0
     if axis == 0:
         other_axis = 2
 
-    for index, type in enumerate(world.boxes):
-        if index == 1 or index == 2 or index == 0: # 1 is white, 2 is blue, 0 is red
-            for box in type:
-                if (checked_box.center[axis] == box.center[axis] + direction and
-                        checked_box.center[other_axis] == box.center[other_axis]):
-                    #Check if a blue, red,  or white box is directly next to the box we are checking along the given
-                    #axis and direction, which is either 1 or -1
-                    if box.color == "white" or box.color == "red":
-                        # If the neighboring box is white or red, return false
-                        return False
-                    else:
-                        # If the neighboring box is blue, check if it has a white box in the next space over
-                        return check_box_collision(world, box, axis, direction)
-    return True
+    # Walk from the checked box through any chain of blue boxes, one neighbor search per step
+    center_axis = checked_box.center[axis]
+    center_other_axis = checked_box.center[other_axis]
+    while True:
+        index = find_neighbor_box(world.all_centers, world.all_types, center_axis,
+                                  center_other_axis, axis, other_axis, direction)
+        if index == -1:
+            # The next space over is empty, so nothing blocks the scale
+            return True
+        if world.all_types[index] != 2: # 2 is blue
+            # If the neighboring box is white or red, return false
+            return False
+        # If the neighboring box is blue, check if it has a white box in the next space over
+        center_axis = world.all_centers[index, axis]
 
 def pan_start(world: World, x: float, y: float):
     '''
@@ -744,14 +907,25 @@ def detect_win(world: World) -> bool:
     Returns:
         bool: returns True if all green boxes are filled, and False otherwise
     '''
-    green_boxes_filled = []
-    for green_box in world.boxes[3]: # 3 is green boxes
-        for blue_box in world.boxes[2]: # 2 is blue boxes
-            if blue_box.center == green_box.center:
-                green_boxes_filled.append(True)
-                blue_box.color = "purple"
+    blue_boxes = world.boxes[2] # 2 is blue boxes
+    green_boxes = world.boxes[3] # 3 is green boxes
+
+    # Blue and green boxes sit in contiguous rows at the end of the stacked centers array, after the
+    # base, red, and white boxes
+    blue_start = 1 + len(world.boxes[0]) + len(world.boxes[1])
+    blue_centers = world.all_centers[blue_start:blue_start + len(blue_boxes)]
+    green_centers = world.all_centers[blue_start + len(blue_boxes):]
+
+    # Compare every blue center against every green center in one broadcast, giving a
+    # (blue, green) grid of matches
+    matches = np.all(blue_centers[:, None] == green_centers[None, :], axis=2)
 
-    return len(green_boxes_filled) == len(world.boxes[3])
+    # Any blue box sitting on a green box turns purple
+    for index in np.flatnonzero(matches.any(axis=1)):
+        blue_boxes[index].color = PURPLE
+
+    # The level is won when every green box has a blue box on it
+    return bool(matches.any(axis=0).all())
 
 def end_level(world: World):
     '''
@@ -768,6 +942,33 @@ def end_level(world: World):
         completed_levels[level_number] = True
         change_scene('level_menu')
 
+@lru_cache(maxsize=None)
+def classify_grid(grid_characters: str, rows: int, x_offset: int, z_offset: int) -> dict[str, tuple]:
+    '''
+    This function finds the box position for every cell of the given level text, caching the result
+    so reloading a level, including the Reset button, skips the grid scan entirely
+
+    Args:
+        grid_characters (str): the level's rows joined top to bottom into one string
+        rows (int): the number of rows in the grid
+        x_offset (int): half the x width of the base, subtracted from each column
+        z_offset (int): half the z width of the base, subtracted from each row
+
+    Returns:
+        dict[str, tuple]: the (x, y, z) positions of each box character's cells
+    '''
+    # The [::-1] is a no-copy negative-stride view that flips the rows, so row i of the flipped
+    # grid maps to z coordinate i - z_offset
+    grid = np.frombuffer(grid_characters.encode(), dtype=np.uint8).reshape(rows, -1)[::-1]
+
+    # Find each character's cells with one vectorized comparison instead of walking the grid
+    positions = {}
+    for character in "rwbg":
+        found_rows, found_columns = np.nonzero(grid == ord(character))
+        positions[character] = tuple((j - x_offset, 0, i - z_offset)
+                                     for i, j in zip(found_rows.tolist(), found_columns.tolist()))
+    return positions
+
 def create_level(level: list[list[str]], base_x, base_z) -> World:
     '''
     This function converts a 2d list of strings representing boxes in a level into level data and returns a World based
@@ -787,28 +988,51 @@ def create_level(level: list[list[str]], base_x, base_z) -> World:
     # b = blue
     # g = green
     base = create_box([base_x, 1, base_z], [0,1,0], "base")
-    red = []
-    white = []
-    blue = []
-    green = []
-    for i, row in enumerate(reversed(level)):
-        for j, character in enumerate(row):
-            if character == "r":
-                red.append(create_box([1,1,1], [j-m.floor(base_x/2), 0, i-m.floor(base_z/2)],
-                                      "red"))
-            elif character == "w":
-                white.append(create_box([1, 1, 1], [j-m.floor(base_x/2), 0, i-m.floor(base_z/2)],
-                                        "white"))
-            elif character == "b":
-                blue.append(create_box([1, 1, 1], [j-m.floor(base_x/2), 0, i-m.floor(base_z/2)],
-                                       "blue"))
-            elif character == "g":
-                green.append(create_box([1, 1, 1], [j-m.floor(base_x/2), 0, i-m.floor(base_z/2)],
-                                        "green"))
+
+    # Look up each character's cell positions from the memoized grid classification, so only the
+    # first load of a level pays for the scan, then create each color's boxes as one batch
+    positions = classify_grid("".join("".join(row) for row in level), len(level),
+                              base_x // 2, base_z // 2)
+    red = create_boxes(positions["r"], RED)
+    white = create_boxes(positions["w"], WHITE)
+    blue = create_boxes(positions["b"], BLUE)
+    green = create_boxes(positions["g"], GREEN)
+    # Register a pair of scene layers per render slot, bottom to top, so draw_box can stack boxes
+    # in render order without recreating their vertex circles every frame
+    all_boxes = [base] + red + white + blue + green
+    layers = []
+    for i in range(len(all_boxes)):
+        layers.append("boxes" + str(i))
+        layers.append("vertices" + str(i))
+    set_scene_layers(layers)
+
+    # Stack every box's points into one pair of world-level arrays, and rebind each box's points
+    # and projected_points as views into them, so the whole world can be transformed in one call
+    all_points = np.vstack([box.points for box in all_boxes])
+    all_projected_points = np.vstack([box.projected_points for box in all_boxes])
+
+    # Stack centers and sizes the same way, so gameplay checks can work over one array instead of
+    # looping box by box; mutating a box's center or size writes straight into the stacked array
+    all_centers = np.array([box.center for box in all_boxes], dtype=np.float32)
+    all_sizes = np.array([box.size for box in all_boxes], dtype=np.float32)
+
+    # Type code per stacked row: -1 for the base, then the box's index into the boxes lists, so
+    # gameplay checks can test box types without touching Box objects
+    all_types = np.full(len(all_boxes), -1, dtype=np.int8)
+    offset = 1
+    for code, type in enumerate([red, white, blue, green]):
+        all_types[offset:offset + len(type)] = code
+        offset += len(type)
+    for index, box in enumerate(all_boxes):
+        box.points = all_points[index * 8:index * 8 + 8]
+        box.projected_points = all_projected_points[index * 8:index * 8 + 8]
+        box.center = all_centers[index]
+        box.size = all_sizes[index]
+
     return World(base, [red, white, blue, green], [], [0.3, 0.3, 0.0], [0, 0], False, False, None, None, False, [
-        create_button("Reset Level", get_width()-50, get_height()-20, "gray"),
-        create_button("Level Select", 50, get_height()-20, "gray")
-    ])
+        create_button("Reset Level", WIDTH-50, HEIGHT-20, "gray"),
+        create_button("Level Select", 50, HEIGHT-20, "gray")
+    ], all_points, all_projected_points, all_centers, all_sizes, all_types, None, True, None)
 
 def create_world() -> World:
     '''
@@ -839,12 +1063,14 @@ def create_main_menu() -> MainMenu:
     x_padding = 10
     y_padding = 10
 
+    # Create the title once and raise it above its border and background, rather than building a
+    # second identical text object just to get it drawn on top
     title = text("black", "Growth Matrix", 50, CENTER[0], CENTER[1]/3)
     title_border = rectangle("white", title.width + 2*x_padding, title.height + 2*y_padding, CENTER[0],
                              CENTER[1]/3)
     title_background = rectangle("lightslategray", title.width + x_padding, title.height + y_padding, CENTER[0],
                                  CENTER[1]/3)
-    title = text("black", "Growth Matrix", 50, CENTER[0], CENTER[1] / 3)
+    title.layer = ':above'
     play_button = create_button("     Play     ", CENTER[0], CENTER[1] * 1.1, "gray")
     instructions_button = create_button("Instructions", CENTER[0], CENTER[1] *1.1 + 40, "gray")
 
@@ -894,30 +1120,18 @@ def create_instructions_menu() -> InstructionsMenu:
     y_padding = 10
     border = rectangle("white", width + 5, height + 5, CENTER[0], CENTER[1])
     background = rectangle("dimgray", width, height, CENTER[0], CENTER[1])
-    instructions = [
-        text("black", "The matrix can be panned around by clicking and dragging the mouse.",
-             20, CENTER[0], CENTER[1]-height/2+25),
-        text("black", "Red boxes can be grown by clicking on them.",
-             20, CENTER[0], CENTER[1]-height/2+50),
-        text("black", "Only one Red box can be grown at a time.",
-             20, CENTER[0], CENTER[1]-height/2+75),
-        text("black", "Blue boxes can be pushed by growing Red boxes or by other Blue boxes.",
-             20, CENTER[0], CENTER[1]-height/2+100),
-        text("black", "White boxes can block the growth of Red boxes in one or two directions.",
-             20, CENTER[0], CENTER[1]-height/2+125),
-        text("black", "To complete each matrix all Green boxes must be filled in with Blue boxes.",
-             20, CENTER[0], CENTER[1]-height/2+150),
-        text("black", "Filled Green boxes will turn Purple.",
-             20, CENTER[0], CENTER[1]-height/2+175)
-    ]
+    instructions = [text("black", line, 20, CENTER[0], CENTER[1] - height / 2 + 25 * (index + 1))
+                    for index, line in enumerate(INSTRUCTIONS_LINES)]
 
     close_button = create_button("Close", CENTER[0], CENTER[1]+height/2-25, "gray")
+
+    # As in the other menus, one title raised above its rectangles replaces the duplicate copy
     title = text("black", "Growth Matrix", 50, CENTER[0], CENTER[1] / 3)
     title_border = rectangle("white", title.width + 2 * x_padding, title.height + 2 * y_padding, CENTER[0],
                              CENTER[1] / 3)
     title_background = rectangle("lightslategray", title.width + x_padding, title.height + y_padding, CENTER[0],
                                  CENTER[1] / 3)
-    title = text("black", "Growth Matrix", 50, CENTER[0], CENTER[1] / 3)
+    title.layer = ':above'
     return InstructionsMenu(background, border, instructions, close_button, title, title_border, title_background)
 
 def instructions_menu_hover(menu: InstructionsMenu):
@@ -959,33 +1173,52 @@ def create_level_menu() -> LevelMenu:
     x_padding = 10
     y_padding = 10
 
+    # Resolve every button's color and the all-complete check with vectorized operations over the
+    # completion flags instead of a per-level branch
+    all_completed = bool(completed_levels.all())
+    colors = np.where(completed_levels, "green", "gray")
+
     level_buttons = []
-    all_completed = True
-    for i in range(0, TOTAL_LEVELS):
-        if completed_levels[i]:
-            color = "green"
-        else:
-            color = "gray"
-            all_completed = False
-        level_buttons.append(create_button("  " + str(i+1) + "  ", i * 50 + 100, CENTER[1], color))
+    for i, color in enumerate(colors.tolist()):
+        button = create_button(LEVEL_BUTTON_LABELS[i], i * 50 + 100, CENTER[1], color)
+        # Buttons start in their idle shade because only the one nearest the mouse is hover-tested
+        button.background.color = button.idle_color
+        level_buttons.append(button)
 
     if not all_completed:
         message = " Levels "
     else:
         message = "    Congratulations! :)    "
 
-    title = text("black", message, 40, CENTER[0], CENTER[1] / 2)
-
-    back_button = create_button("   back   ", 50, get_height()-20, "gray")
+    back_button = create_button("   back   ", 50, HEIGHT-20, "gray")
 
+    # The title that is kept is the size-50 one; it used to be preceded by a throwaway size-40 copy
+    # whose measurements sized the rectangles, so the border now fits the title it actually frames
+    title = text("black", message, 50, CENTER[0], CENTER[1] / 3)
     title_border = rectangle("white", title.width + 2 * x_padding, title.height + 2 * y_padding, CENTER[0],
                              CENTER[1] / 3)
     title_background = rectangle("lightslategray", title.width + x_padding, title.height + y_padding, CENTER[0],
                                  CENTER[1] / 3)
+    title.layer = ':above'
 
-    title = text("black", message, 50, CENTER[0], CENTER[1] / 3)
+    return LevelMenu(title, title_border, title_background, level_buttons, back_button, -1)
 
-    return LevelMenu(title, title_border, title_background, level_buttons, back_button)
+def hovered_level_index() -> int:
+    '''
+    This function computes which level button the mouse is nearest from the menu's fixed 50 pixel
+    button spacing, so only that one button needs a real hover test
+
+    Args:
+        None
+
+    Returns:
+        int: the index of the level button nearest the mouse, or -1 if the mouse is outside the row
+    '''
+    # Buttons are centered every 50 pixels starting at x = 100, and are narrower than the spacing
+    index = (get_mouse_x() - 100 + 25) // 50
+    if 0 <= index < TOTAL_LEVELS:
+        return index
+    return -1
 
 def level_menu_button_hover(menu: LevelMenu):
     '''
@@ -997,8 +1230,15 @@ def level_menu_button_hover(menu: LevelMenu):
     Returns:
         None
     '''
-    for button in menu.level_buttons:
-        button_hover(button)
+    # Hover-test only the button nearest the mouse; the others cannot be hovered
+    index = hovered_level_index()
+    if menu.hovered_index != index and menu.hovered_index != -1:
+        # The mouse moved to a different slot, so un-highlight the previously tested button
+        previous = menu.level_buttons[menu.hovered_index]
+        previous.background.color = previous.idle_color
+    menu.hovered_index = index
+    if index != -1:
+        button_hover(menu.level_buttons[index])
     button_hover(menu.back_button)
 
 def level_menu_click(menu: LevelMenu):
@@ -1014,38 +1254,71 @@ def level_menu_click(menu: LevelMenu):
     if button_hover(menu.back_button):
         change_scene('main_menu')
 
-    for i, button in enumerate(menu.level_buttons):
-        if button_hover(button):
-            global level_number
-            level_number = i
-            change_scene('game')
-
+    # Only the button nearest the mouse can have been clicked
+    index = hovered_level_index()
+    if index != -1 and button_hover(menu.level_buttons[index]):
+        global level_number
+        level_number = index
+        change_scene('game')
 
-# Main menu events
-when('starting: main_menu', create_main_menu)
-when('updating: main_menu', main_menu_button_hover)
-when('clicking: main_menu', main_menu_click)
 
-# Instructions menu events
-when('starting: instructions_menu', create_instructions_menu)
-when('updating: instructions_menu', instructions_menu_hover)
-when('clicking: instructions_menu', instructions_menu_click)
+def game_mouse_down(world: World, x: float, y: float):
+    '''
+    This function handles a mouse press in the game scene, checking the UI buttons and starting a
+    pan with one dispatch instead of two separately registered handlers
 
-# Level select menu events
-when('starting: level_menu', create_level_menu)
-when('updating: level_menu', level_menu_button_hover)
-when('clicking: level_menu', level_menu_click)
+    Args:
+        world (World): the current world data
+        x (float): the x position of the click
+        y (float): the y position of the click
 
+    Returns:
+        None
+    '''
+    check_game_button_press(world)
+    pan_start(world, x, y)
 
-# Game events
-when('starting: game', create_world)
+def update_game(world: World):
+    '''
+    This function runs the game scene's per-frame work, checking for a win and then updating the
+    world, with one dispatch instead of two separately registered handlers
 
-when('clicking: game', red_box_interaction)
-when('input.mouse.down: game', check_game_button_press)
-when('input.mouse.down: game', pan_start)
-when('input.mouse.up: game', pan_end)
+    Args:
+        world (World): the current world data
 
-when('updating: game', end_level)
-when('updating: game', main)
+    Returns:
+        None
+    '''
+    end_level(world)
+    main(world)
+
+# Every scene's event handlers, registered through one loop below instead of a block of when calls
+# per scene
+EVENT_HANDLERS = (
+    # Main menu events
+    ('starting: main_menu', create_main_menu),
+    ('updating: main_menu', main_menu_button_hover),
+    ('clicking: main_menu', main_menu_click),
+
+    # Instructions menu events
+    ('starting: instructions_menu', create_instructions_menu),
+    ('updating: instructions_menu', instructions_menu_hover),
+    ('clicking: instructions_menu', instructions_menu_click),
+
+    # Level select menu events
+    ('starting: level_menu', create_level_menu),
+    ('updating: level_menu', level_menu_button_hover),
+    ('clicking: level_menu', level_menu_click),
+
+    # Game events
+    ('starting: game', create_world),
+    ('clicking: game', red_box_interaction),
+    ('input.mouse.down: game', game_mouse_down),
+    ('input.mouse.up: game', pan_end),
+    ('updating: game', update_game),
+)
+
+for event, handler in EVENT_HANDLERS:
+    when(event, handler)
 
 start(scene='main_menu')
\ No newline at end of file